@@ -1,23 +1,17 @@
 import os
 import logging
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import time
 import random
 from datetime import datetime
 import sys
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from pymongo import MongoClient
-import openai
 from dotenv import load_dotenv
 
 # 載入環境變數
 load_dotenv()
 
-# OpenAI 設置
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# 注意：requests、BeautifulSoup、pymongo、smtplib 等較重的模組改在使用它們的函式內才匯入，
+# 讓 --dry-run 或關閉某個管道時不必付出這些匯入成本（可用 --startup-report 檢查）
 
 # ============ RSS 來源與開關 ============
 RSS_SOURCES = {
@@ -31,29 +25,51 @@ RSS_SOURCES = {
     "Yahoo TOPSTORY": {"url": "https://news.yahoo.com/rss/topstories", "enabled": 0},
 }
 
+# ============ 輸出管道與開關 ============
+# 關閉的管道不會被呼叫，其相依模組（pymongo、smtplib 等）也不會被匯入
+SINKS = {
+    "MongoDB": {"enabled": 1},
+    "Discord": {"enabled": 1},
+    "Email": {"enabled": 1},
+    "Telegram": {"enabled": 1},
+}
+
+# ============ 解析器設置 ============
+# RSS 使用 lxml 的 "xml" 解析器，文章內容使用內建的 "html.parser"
+RSS_PARSER = "xml"
+ARTICLE_PARSER = "html.parser"
+
 
 # MongoDB 設置
 MONGO_URI = os.getenv("MONGO_URI")
 MONGO_DB = os.getenv("MONGO_DB", "financial_news")  # 提供默認值
 MONGO_COLLECTION = os.getenv("MONGO_COLLECTION", "global_market_news")  # 提供默認值
 
-# 設置 logging
+# 設置 logging（handler 於 setup_logging 中才建立）
 logger = logging.getLogger("FinancialNewsBot")
 logger.setLevel(logging.INFO)
 
-# Console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.addHandler(console_handler)
+def setup_logging(log_file=None):
+    """設置 console handler，並在指定 log_file 時另外寫入檔案（每次執行會覆寫舊檔）"""
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
 
-# File handler
-file_handler = logging.FileHandler("bot.log", encoding="utf-8")
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
+    # File handler
+    if log_file:
+        file_handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        logger.addHandler(file_handler)
 
 def save_to_mongodb(report_content, source, date):
     """將報告存入 MongoDB"""
+    client = None
     try:
+        from pymongo import MongoClient
+
         client = MongoClient(MONGO_URI)
         db = client[MONGO_DB]
         collection = db[MONGO_COLLECTION]
@@ -68,11 +84,14 @@ def save_to_mongodb(report_content, source, date):
     except Exception as e:
         logger.error(f"MongoDB 寫入失敗: {e}")
     finally:
-        client.close()
+        if client is not None:
+            client.close()
 
 def send_to_discord(webhook_url, message, date):
     """發送訊息到 Discord（以檔案形式）"""
     try:
+        import requests
+
         # 建立檔案名稱，包含日期以便識別
         file_name = f"888全球股市日報_{date.replace('/', '-')}.txt"
         
@@ -114,12 +133,15 @@ def clear_file(file_name):
 
 def scrape_articles(article_urls, content_selector, file_name):
     """爬取文章內容"""
+    import requests
+    from bs4 import BeautifulSoup
+
     articles = []
     for index, url in enumerate(article_urls, 1):
         try:
             response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
+                soup = BeautifulSoup(response.text, ARTICLE_PARSER)
                 content = "\n".join([p.get_text(strip=True) for p in soup.select(content_selector)])
                 if content:
                     articles.append({"URL": url, "Content": content})
@@ -136,9 +158,12 @@ def scrape_articles(article_urls, content_selector, file_name):
 def scrape_rss_feed(rss_url, content_selector, file_name):
     """爬取 RSS feed"""
     try:
+        import requests
+        from bs4 import BeautifulSoup
+
         response = requests.get(rss_url, timeout=30)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "xml")
+            soup = BeautifulSoup(response.text, RSS_PARSER)
             items = soup.find_all("item")
             urls = [item.link.text for item in items if item.link]
             scrape_articles(urls, content_selector, file_name)
@@ -150,6 +175,8 @@ def scrape_rss_feed(rss_url, content_selector, file_name):
 def generate_report_with_openai(date):
     """使用 OpenAI API 生成報告"""
     try:
+        import requests
+
         # url = "https://api.openai.com/v1/chat/completions"
         
         url = "https://generativelanguage.googleapis.com/v1beta/openai/chat/completions"        
@@ -231,6 +258,10 @@ def generate_report_with_openai(date):
 def send_email(report_content, date):
     """發送電子郵件"""
     try:
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         smtp_server = os.getenv("SMTP_SERVER")
         port = int(os.getenv("SMTP_PORT"))
         sender_email = os.getenv("SENDER_EMAIL")
@@ -253,6 +284,8 @@ def send_email(report_content, date):
 def send_telegram_message(report_content, date):
     """發送 Telegram 消息"""
     try:
+        import requests
+
         bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         channel_id = os.getenv("TELEGRAM_CHANNEL_ID")
         url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
@@ -284,11 +317,59 @@ def send_telegram_message(report_content, date):
     except Exception as e:
         logger.error(f"Telegram 消息發送失敗: {e}")
 
+def report_startup_time(top=15):
+    """以 python -X importtime 量測匯入本程式的冷啟動成本，並列出最耗時的模組"""
+    import subprocess
+
+    module_dir, module_file = os.path.split(os.path.abspath(__file__))
+    module_name = os.path.splitext(module_file)[0]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=module_dir, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"匯入 {module_name} 失敗:\n{result.stderr}")
+        return
+
+    # importtime 每行格式: "import time: self [us] | cumulative | imported package"
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(self_us), int(cumulative_us), name.strip()))
+
+    total_us = sum(self_us for self_us, _, _ in timings)
+    print(f"啟動並匯入 {module_name} 共載入 {len(timings)} 個模組，總計 {total_us / 1000:.1f} ms")
+    print(f"{'self [ms]':>10} {'cumulative [ms]':>16}  模組")
+    for self_us, cumulative_us, name in sorted(timings, reverse=True)[:top]:
+        print(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>16.1f}  {name}")
+
+def parse_args():
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="財經新聞分析機器人")
+    parser.add_argument("--dry-run", "--only-scrape", dest="dry_run", action="store_true",
+                        help="只爬取新聞寫入 allnews.txt，不生成報告、不發送、不寫入 bot.log")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="輸出 python -X importtime 的啟動匯入成本報告後結束")
+    return parser.parse_args()
+
 def main():
     """主程序"""
+    args = parse_args()
+
+    if args.startup_report:
+        report_startup_time()
+        return
+
+    # dry run 不寫入 bot.log（寫入模式會覆寫舊的 log）
+    setup_logging(None if args.dry_run else "bot.log")
+
+    # 獲取今天日期
+    today_date = datetime.now().strftime("%Y/%m/%d")
+
     try:
         # 清空舊檔案
-        clear_file("bot.log")
         clear_file("allnews.txt")
 
         # 爬取新聞
@@ -298,8 +379,9 @@ def main():
                 logger.info(f"正在處理 RSS 源: {name}")
                 scrape_rss_feed(data["url"], "p", "allnews.txt")
 
-        # 獲取今天日期
-        today_date = datetime.now().strftime("%Y/%m/%d")
+        if args.dry_run:
+            logger.info("Dry run：已完成爬取，略過報告生成與發送")
+            return
 
         # 生成報告
         logger.info("正在生成報告...")
@@ -308,26 +390,31 @@ def main():
             raise Exception("報告生成失敗")
 
         # 保存到 MongoDB
-        logger.info("保存報告到 MongoDB...")
-        save_to_mongodb(report, "RSS_Feed_Analysis", today_date)
+        if SINKS["MongoDB"]["enabled"]:
+            logger.info("保存報告到 MongoDB...")
+            save_to_mongodb(report, "RSS_Feed_Analysis", today_date)
 
         # 發送到 Discord
-        logger.info("發送報告到 Discord...")
-        discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
-        send_to_discord(discord_webhook_url, report, today_date)
+        if SINKS["Discord"]["enabled"]:
+            logger.info("發送報告到 Discord...")
+            discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+            send_to_discord(discord_webhook_url, report, today_date)
 
         # 發送電子郵件
-        logger.info("發送電子郵件...")
-        send_email(report, today_date)
+        if SINKS["Email"]["enabled"]:
+            logger.info("發送電子郵件...")
+            send_email(report, today_date)
 
         # 發送到 Telegram
-        logger.info("發送到 Telegram...")
-        send_telegram_message(report, today_date)
+        if SINKS["Telegram"]["enabled"]:
+            logger.info("發送到 Telegram...")
+            send_telegram_message(report, today_date)
 
     except Exception as e:
         logger.error(f"執行過程發生錯誤: {e}")
         # 可以在這裡添加錯誤通知機制
-        send_telegram_message(f"執行過程發生錯誤: {e}", today_date)
+        if not args.dry_run and SINKS["Telegram"]["enabled"]:
+            send_telegram_message(f"執行過程發生錯誤: {e}", today_date)
 
 if __name__ == "__main__":
     main()